@@ -28,6 +28,18 @@ SPEED = 20 # Game speed
 sX = 1 # Initial snake x-direction
 sY = 0 # Initial snake y-direction
 
+# Render quality constants
+QUALITY_LEVELS = ["full glow", "reduced glow", "head + food glow", "flat"] # Highest to lowest quality
+FIXED_QUALITY = None # Set to an index of QUALITY_LEVELS to lock render quality (benchmarking)
+GLOW_RADIUS = 35 # Glow radius at full quality
+REDUCED_GLOW_RADIUS = 15 # Glow radius at reduced quality
+QUALITY_WINDOW = 30 # Number of frames averaged before changing quality
+QUALITY_DOWNGRADE = 0.85 # Drop quality when average frame time exceeds this share of the frame budget
+QUALITY_UPGRADE = 0.7 # Raise quality when the predicted frame time at the higher level is below this share of the frame budget
+QUALITY_OVER_BUDGET_FRAMES = 5 # Consecutive frames over the downgrade threshold that drop quality early
+QUALITY_SAMPLE_CAP = 3 # Cap on a single frame time, as a multiple of the frame budget
+QUALITY_MESSAGE_MS = 2000 # How long quality changes stay on screen
+
 theme_dict = {
     "classic": {
         "background_color": "#E8E9EB",
@@ -203,6 +215,108 @@ class Restart:
         self.new_theme = None
         self.new_difficulty = None
 
+# Watches frame times and steps render quality down or up to hold the frame budget
+class QualityGovernor:
+    def __init__(self, fixed_level=FIXED_QUALITY):
+        # Check the locked quality level is a valid index into QUALITY_LEVELS
+        if fixed_level is not None and (not isinstance(fixed_level, int) or not 0 <= fixed_level < len(QUALITY_LEVELS)):
+            raise ValueError(f"FIXED_QUALITY must be None or an integer from 0 to {len(QUALITY_LEVELS) - 1}, got {fixed_level!r}")
+        self.fixed = fixed_level is not None # Flag for a locked quality level
+        self.level = fixed_level if self.fixed else 0 # Index into QUALITY_LEVELS
+        self.font = pygame.font.Font(FONT, 11) # Overlay font
+        self.message_surface = None # Rendered overlay text
+        self.message_until = 0 # Time the overlay text disappears
+        self.reset()
+        if self.fixed:
+            self.report(f"Render quality fixed at {QUALITY_LEVELS[self.level]}")
+
+    # Clear frame time history at the start of each game
+    def reset(self):
+        if not self.fixed:
+            self.level = 0
+        self.frame_times = [] # Recent frame times in milliseconds
+        self.over_budget_frames = 0 # Consecutive frames over the downgrade threshold
+        self.target_fps = None # Frame rate the current samples were measured against
+        self.failed_costs = {} # Average frame time that forced a downgrade from each level
+        self.arrival_costs = {} # First window average after a downgrade to each level
+
+    # Record the time spent on the last frame and adjust quality if needed
+    def update(self, frame_time, target_fps):
+        if self.fixed:
+            return
+
+        # Start a fresh window when the game speeds up so samples share one budget
+        if target_fps != self.target_fps:
+            self.target_fps = target_fps
+            self.frame_times = []
+            self.over_budget_frames = 0
+
+        # Cap single frames so one stall can't decide a whole window
+        budget = 1000 / target_fps
+        frame_time = min(frame_time, budget * QUALITY_SAMPLE_CAP)
+        self.frame_times.append(frame_time)
+
+        # Drop quality quickly when several frames in a row miss the threshold
+        if frame_time > budget * QUALITY_DOWNGRADE:
+            self.over_budget_frames += 1
+        else:
+            self.over_budget_frames = 0
+        if self.over_budget_frames >= QUALITY_OVER_BUDGET_FRAMES:
+            recent = self.frame_times[-QUALITY_OVER_BUDGET_FRAMES:]
+            self.downgrade(sum(recent) / len(recent), budget)
+            return
+
+        if len(self.frame_times) < QUALITY_WINDOW:
+            return
+
+        average = sum(self.frame_times) / len(self.frame_times)
+        self.frame_times = [] # Start a fresh window after every decision
+
+        if average > budget * QUALITY_DOWNGRADE:
+            self.downgrade(average, budget)
+        elif self.level > 0:
+            if self.level not in self.arrival_costs:
+                # Measure the new level for a window before judging an upgrade
+                self.arrival_costs[self.level] = average
+                return
+            # Scale the cost that failed at the higher level by how this level's cost has changed since
+            predicted = average * self.failed_costs[self.level - 1] / max(self.arrival_costs[self.level], 0.001)
+            if predicted < budget * QUALITY_UPGRADE:
+                self.set_level(self.level - 1, average, budget)
+
+    def downgrade(self, average, budget):
+        self.frame_times = []
+        self.over_budget_frames = 0
+        self.arrival_costs.setdefault(self.level, average) # Count this as the level's first measurement
+        if self.level < len(QUALITY_LEVELS) - 1:
+            self.failed_costs[self.level] = average
+            self.arrival_costs.pop(self.level + 1, None)
+            self.set_level(self.level + 1, average, budget)
+
+    def set_level(self, level, average, budget):
+        self.level = level
+        self.report(f"Render quality: {QUALITY_LEVELS[level]} ({average:.1f}ms/{budget:.1f}ms)")
+
+    # Log a quality change and show it on screen for a moment
+    def report(self, message):
+        print(message)
+        self.message_surface = self.font.render(message, True, (255, 255, 255), (0, 0, 0))
+        self.message_until = pygame.time.get_ticks() + QUALITY_MESSAGE_MS
+
+    def glow_radius(self):
+        return REDUCED_GLOW_RADIUS if self.level >= 1 else GLOW_RADIUS
+
+    # Check if a snake segment or the food should glow at the current level
+    def glows(self, is_head_or_food):
+        if self.level <= 1:
+            return True
+        return self.level == 2 and is_head_or_food
+
+    # Draw the latest quality change in the top left corner
+    def draw(self, screen):
+        if self.message_surface and pygame.time.get_ticks() < self.message_until:
+            screen.blit(self.message_surface, (10, 10))
+
 #### Main Functions
 # Function to display pre-game selection menus
 def display_menu(GRID_WIDTH, GRID_HEIGHT, screen, text, themes):
@@ -414,7 +528,7 @@ def intro_screen(DISPLAY_WIDTH, DISPLAY_HEIGHT, screen, logo, game_title):
                 running = False
                 break
 
-def game_loop(running, screen, clock, game_theme, high_scores, difficulty_value):
+def game_loop(running, screen, clock, quality, game_theme, high_scores, difficulty_value):
     # Initialize colors and game objects
     background_color, snake_color, food_color = game_theme["background_color"], game_theme["snake_color"], game_theme["food_color"]
     snake = Snake(SNEK_START_LEN)
@@ -431,6 +545,10 @@ def game_loop(running, screen, clock, game_theme, high_scores, difficulty_value)
     GROWTH_EVENT = pygame.USEREVENT + 1
     growth_counter = 0
 
+    # Reset the render quality governor for the new game
+    quality.reset()
+    clock.tick() # Reset the clock so time spent in menus isn't counted as the first frame
+
     # Main game loop
     while not game_over:
         # Handle events
@@ -490,18 +608,27 @@ def game_loop(running, screen, clock, game_theme, high_scores, difficulty_value)
         screen.fill(background_color)
 
         # Draw snake
+        glow_radius = quality.glow_radius()
         for i, segment in enumerate(snake.body):
             segment_alpha = 100 - int(0.5 * 100 * (i / (len(snake.body) - 1)))
             segment_color = hex_to_rgb(snake_color)
-            draw_cell(screen, segment, segment_color, glow_color=segment_color, alpha=segment_alpha)
+            segment_glow = segment_color if quality.glows(i == 0) else None
+            draw_cell(screen, segment, segment_color, glow_color=segment_glow, glow_radius=glow_radius, alpha=segment_alpha)
 
         #Draw food
-        draw_cell(screen, food.position, food_color, glow_color=hex_to_rgb(food_color))
+        food_glow = hex_to_rgb(food_color) if quality.glows(True) else None
+        draw_cell(screen, food.position, food_color, glow_color=food_glow, glow_radius=glow_radius)
+
+        # Draw render quality changes
+        quality.draw(screen)
 
         # Update the display and control game speed
         pygame.display.flip()
         clock.tick(difficulty_value)
 
+        # Adjust render quality using the frame time without the tick delay
+        quality.update(clock.get_rawtime(), difficulty_value)
+
     return running, score, background_color, snake_color, high_scores
 
 def game_over(running, restart, GRID_WIDTH, GRID_HEIGHT, screen, score, high_scores, snake_color, background_color):
@@ -596,6 +723,7 @@ def game_over(running, restart, GRID_WIDTH, GRID_HEIGHT, screen, score, high_sco
     return running, restart
 
 def main(GRID_WIDTH, GRID_HEIGHT):
+    quality = QualityGovernor() # Render quality governor, checks FIXED_QUALITY before anything else
     pygame.mixer.music.load(music_file)
     pygame.display.set_icon(snake_logo) # Set snake logo as window icon
     screen = pygame.display.set_mode((GRID_WIDTH * CELL_SIZE, GRID_HEIGHT * CELL_SIZE), pygame.FULLSCREEN) # Create a full screen view
@@ -626,7 +754,7 @@ def main(GRID_WIDTH, GRID_HEIGHT):
         restart = Restart()
 
         # Play the game and update high scores
-        running, score, background_color, snake_color, high_scores = game_loop(running, screen, clock, game_theme, high_scores, difficulty_value)
+        running, score, background_color, snake_color, high_scores = game_loop(running, screen, clock, quality, game_theme, high_scores, difficulty_value)
 
         # Display a "Game Over" screen
         if running: